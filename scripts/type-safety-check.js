@@ -12,21 +12,70 @@
  * @since v4.11.0
  */
 
+const crypto = require('crypto');
 const fs = require('fs');
+const os = require('os');
 const path = require('path');
+const { Worker, isMainThread, parentPort, workerData } = require('worker_threads');
+const { RULES, getSeverity, getSuggestion } = require('./type-safety-rules');
 
 // 配置
 const CONFIG = {
-  srcDir: path.join(__dirname, '../src/renderer'),
-  excludePatterns: [/node_modules/, /\.d\.ts$/, /test/, /__tests__/],
-  checkPatterns: {
-    unknownUsage: /:\s*unknown\b/g,
-    anyAssertion: /as\s+any\b/g,
-    anyType: /:\s*any\b/g,
-    deprecatedTypes: /(ApiResponse|BaseApiResponse|BaseResponse)<.*unknown.*>/g
-  }
+  srcDir: path.join(__dirname, '../src/renderer')
 };
 
+// 扫描结果缓存：按 mtime + size 指纹跳过未改动的文件
+const CACHE_FILE = path.join(__dirname, '../reports/.type-safety-cache.json');
+
+// 规则表指纹：规则有任何增删改（类型、触发串、正则）时整个缓存作废，
+// 避免规则更新后继续回放旧规则算出的结果
+const CACHE_VERSION = crypto
+  .createHash('sha1')
+  .update(RULES.map((rule) => `${rule.type}:${rule.trigger}:${rule.pattern.source}`).join('|'))
+  .digest('hex');
+
+// 上次读到的缓存原文，内容没变时跳过重写
+let lastCacheRaw = '';
+
+function loadCache() {
+  try {
+    lastCacheRaw = fs.readFileSync(CACHE_FILE, 'utf8');
+    const cache = JSON.parse(lastCacheRaw);
+    if (cache.version !== CACHE_VERSION) {
+      lastCacheRaw = '';
+      return {};
+    }
+    return cache.files || {};
+  } catch {
+    return {};
+  }
+}
+
+function saveCache(files) {
+  const serialized = JSON.stringify({ version: CACHE_VERSION, files });
+  if (serialized === lastCacheRaw) {
+    return;
+  }
+  try {
+    fs.mkdirSync(path.dirname(CACHE_FILE), { recursive: true });
+    // 先写临时文件再原子替换，避免写一半被读到
+    fs.writeFileSync(`${CACHE_FILE}.tmp`, serialized);
+    fs.renameSync(`${CACHE_FILE}.tmp`, CACHE_FILE);
+  } catch (error) {
+    console.warn(`警告: 无法写入扫描缓存: ${error.message}`);
+  }
+}
+
+// 排除规则都是固定字符串，用 includes/endsWith 代替正则匹配
+function isExcluded(relativePath) {
+  // 'test' 子串检查已覆盖 '__tests__' 目录
+  return (
+    relativePath.includes('node_modules') ||
+    relativePath.endsWith('.d.ts') ||
+    relativePath.includes('test')
+  );
+}
+
 // 颜色输出
 const colors = {
   red: '\x1b[31m',
@@ -41,78 +90,223 @@ function colorize(text, color) {
   return `${colors[color]}${text}${colors.reset}`;
 }
 
-// 扫描文件
-function scanDirectory(dir) {
-  const results = [];
+// 将给定规则合并为一个带命名分组的正则，整个文件只需扫描一次，
+// 而不是 行数 × 规则数 次
+function buildScanner(rules) {
+  const source = rules.map((rule) => `(?<${rule.type}>${rule.pattern.source})`).join('|');
+  return new RegExp(source, 'g');
+}
+
+// 已编译的扫描器按启用规则的位掩码缓存在模块级，
+// 同一种规则组合整个进程只编译一次
+const scannerCache = new Map();
+
+function getScanner(active, mask) {
+  let scanner = scannerCache.get(mask);
+  if (!scanner) {
+    scanner = buildScanner(active);
+    scannerCache.set(mask, scanner);
+  }
+  // 复用共享的 /g 正则前必须重置扫描位置
+  scanner.lastIndex = 0;
+  return scanner;
+}
 
-  function scanFile(filePath) {
-    const relativePath = path.relative(CONFIG.srcDir, filePath);
+// 计算每行起始偏移，用于把匹配位置换算成行号
+function buildLineIndex(content) {
+  const lineStarts = [0];
+  let pos = content.indexOf('\n');
+  while (pos !== -1) {
+    lineStarts.push(pos + 1);
+    pos = content.indexOf('\n', pos + 1);
+  }
+  return lineStarts;
+}
 
-    // 跳过排除的文件
-    if (CONFIG.excludePatterns.some((pattern) => pattern.test(relativePath))) {
-      return;
+// 二分查找匹配偏移所在的行（返回 0 基行下标）
+function locateLine(lineStarts, offset) {
+  let lo = 0;
+  let hi = lineStarts.length - 1;
+  while (lo < hi) {
+    const mid = (lo + hi + 1) >> 1;
+    if (lineStarts[mid] <= offset) {
+      lo = mid;
+    } else {
+      hi = mid - 1;
     }
+  }
+  return lo;
+}
 
-    try {
-      const content = fs.readFileSync(filePath, 'utf8');
-      const lines = content.split('\n');
-
-      const fileIssues = {
-        file: relativePath,
-        issues: []
-      };
-
-      // 检查每种模式
-      Object.entries(CONFIG.checkPatterns).forEach(([type, pattern]) => {
-        lines.forEach((line, index) => {
-          const matches = line.match(pattern);
-          if (matches) {
-            matches.forEach((match) => {
-              fileIssues.issues.push({
-                type,
-                line: index + 1,
-                content: line.trim(),
-                match
-              });
-            });
-          }
-        });
-      });
+// 用给定规则集扫描 text，每处命中通过 report(偏移, 类型, 命中文本) 上报。
+// 合并正则在同一位置只命中一条规则，较长的命中区间（如 deprecatedTypes 吃掉的
+// 整个泛型参数列表）里可能还嵌着其他规则的问题，用剩余规则对该区间补扫
+function collectIssues(text, rules, baseOffset, report) {
+  const mask = rules.reduce((bits, rule) => bits | (1 << RULES.indexOf(rule)), 0);
+  const scanner = getScanner(rules, mask);
+
+  let m;
+  while ((m = scanner.exec(text)) !== null) {
+    // 命名分组中唯一有值的那个就是命中的检查类型
+    const type = Object.keys(m.groups).find((name) => m.groups[name] !== undefined);
+    report(baseOffset + m.index, type, m[0]);
+
+    // 补扫去掉已命中规则，子集掩码必然不同，不会干扰本层扫描器的 lastIndex
+    const rest = rules.filter((rule) => rule.type !== type);
+    if (rest.some((rule) => m[0].includes(rule.trigger))) {
+      collectIssues(m[0], rest, baseOffset + m.index, report);
+    }
 
-      if (fileIssues.issues.length > 0) {
-        results.push(fileIssues);
-      }
-    } catch (error) {
-      console.warn(`警告: 无法读取文件 ${filePath}: ${error.message}`);
+    // 防止零宽匹配时死循环
+    if (m.index === scanner.lastIndex) {
+      scanner.lastIndex++;
+    }
+  }
+}
+
+// 扫描单个文件，无问题时返回 null
+function scanFile(filePath) {
+  const relativePath = path.relative(CONFIG.srcDir, filePath);
+
+  // 跳过排除的文件
+  if (isExcluded(relativePath)) {
+    return null;
+  }
+
+  try {
+    const raw = fs.readFileSync(filePath);
+
+    // 预筛直接在字节层做（触发串都是 ASCII，在 UTF-8 中不会出现在多字节序列里），
+    // 只保留触发串出现过的规则，一条都没有的文件连解码都省掉
+    const active = RULES.filter((rule) => raw.includes(rule.trigger));
+    if (active.length === 0) {
+      return null;
     }
+
+    const content = raw.toString('utf8');
+    // 行偏移索引推迟到第一次命中才构建，多数文件无命中，直接省掉这份分配
+    let lineStarts = null;
+
+    const fileIssues = {
+      file: relativePath,
+      issues: []
+    };
+
+    collectIssues(content, active, 0, (offset, type, matchText) => {
+      if (!lineStarts) {
+        lineStarts = buildLineIndex(content);
+      }
+      const lineIndex = locateLine(lineStarts, offset);
+      const lineEnd =
+        lineIndex + 1 < lineStarts.length ? lineStarts[lineIndex + 1] - 1 : content.length;
+
+      fileIssues.issues.push({
+        type,
+        line: lineIndex + 1,
+        content: content.slice(lineStarts[lineIndex], lineEnd).trim(),
+        match: matchText
+      });
+    });
+
+    return fileIssues.issues.length > 0 ? fileIssues : null;
+  } catch (error) {
+    console.warn(`警告: 无法读取文件 ${filePath}: ${error.message}`);
+    return null;
   }
+}
+
+// 待扫描文件数达到该值才启用工作线程，避免小任务付出线程启动开销
+const PARALLEL_THRESHOLD = 64;
+
+// 把文件列表切块分给工作线程扫描，按原顺序返回各文件的结果
+function scanFilesInWorkers(files) {
+  const workerCount = Math.min(os.cpus().length, Math.ceil(files.length / PARALLEL_THRESHOLD));
+  const chunkSize = Math.ceil(files.length / workerCount);
+  const tasks = [];
+
+  for (let i = 0; i < files.length; i += chunkSize) {
+    const chunk = files.slice(i, i + chunkSize);
+    tasks.push(
+      new Promise((resolve, reject) => {
+        const worker = new Worker(__filename, { workerData: { files: chunk } });
+        worker.once('message', resolve);
+        worker.once('error', reject);
+      })
+    );
+  }
+
+  return Promise.all(tasks).then((chunks) => chunks.flat());
+}
+
+// 扫描文件
+async function scanDirectory(dir) {
+  const cache = loadCache();
+  const nextCache = {};
+  const entries = [];
+  const pending = [];
 
   function walkDirectory(currentDir) {
-    const items = fs.readdirSync(currentDir);
+    // withFileTypes 直接拿到目录项类型，只有候选文件才需要 stat 取指纹
+    const items = fs.readdirSync(currentDir, { withFileTypes: true });
 
     items.forEach((item) => {
-      const itemPath = path.join(currentDir, item);
-      const stat = fs.statSync(itemPath);
+      const itemPath = path.join(currentDir, item.name);
 
-      if (stat.isDirectory()) {
+      if (item.isDirectory()) {
         walkDirectory(itemPath);
-      } else if (stat.isFile() && (item.endsWith('.ts') || item.endsWith('.vue'))) {
-        scanFile(itemPath);
+      } else if (item.isFile() && (item.name.endsWith('.ts') || item.name.endsWith('.vue'))) {
+        const stat = fs.statSync(itemPath);
+        const key = path.relative(CONFIG.srcDir, itemPath);
+        const prev = cache[key];
+        const entry = { key, mtimeMs: stat.mtimeMs, size: stat.size, issues: null };
+
+        // 指纹未变则直接复用上次的扫描结果，否则排队等待扫描
+        if (prev && prev.mtimeMs === stat.mtimeMs && prev.size === stat.size) {
+          entry.issues = prev.issues;
+        } else {
+          pending.push({ entry, filePath: itemPath });
+        }
+        entries.push(entry);
       }
     });
   }
 
   walkDirectory(dir);
+
+  // 缓存命中之外的文件：量大时分给工作线程，量小时主线程直接扫
+  if (pending.length >= PARALLEL_THRESHOLD) {
+    const scanned = await scanFilesInWorkers(pending.map((p) => p.filePath));
+    scanned.forEach((issues, index) => {
+      pending[index].entry.issues = issues;
+    });
+  } else {
+    pending.forEach((p) => {
+      p.entry.issues = scanFile(p.filePath);
+    });
+  }
+
+  const results = [];
+  entries.forEach((entry) => {
+    nextCache[entry.key] = { mtimeMs: entry.mtimeMs, size: entry.size, issues: entry.issues };
+    if (entry.issues) {
+      results.push(entry.issues);
+    }
+  });
+
+  saveCache(nextCache);
   return results;
 }
 
 // 生成报告
+// 输出行先积累在数组里，最后一次性写出，避免每个问题 4~5 次 console.log 系统调用
 function generateReport(results) {
-  console.log(colorize('\n🔍 TypeScript 类型安全检查报告', 'bold'));
-  console.log(colorize('='.repeat(50), 'blue'));
+  const out = [];
+  out.push(colorize('\n🔍 TypeScript 类型安全检查报告', 'bold'));
+  out.push(colorize('='.repeat(50), 'blue'));
 
   if (results.length === 0) {
-    console.log(colorize('\n✅ 恭喜！未发现类型安全问题。', 'green'));
+    out.push(colorize('\n✅ 恭喜！未发现类型安全问题。', 'green'));
+    process.stdout.write(`${out.join('\n')}\n`);
     return;
   }
 
@@ -120,7 +314,7 @@ function generateReport(results) {
   const issueStats = {};
 
   results.forEach((fileResult) => {
-    console.log(colorize(`\n📁 ${fileResult.file}`, 'yellow'));
+    out.push(colorize(`\n📁 ${fileResult.file}`, 'yellow'));
 
     fileResult.issues.forEach((issue) => {
       totalIssues++;
@@ -129,57 +323,54 @@ function generateReport(results) {
       const severity = getSeverity(issue.type);
       const severityColor = severity === 'high' ? 'red' : severity === 'medium' ? 'yellow' : 'blue';
 
-      console.log(`  ${colorize('●', severityColor)} 第${issue.line}行: ${issue.type}`);
-      console.log(`    ${colorize(issue.content, 'reset')}`);
-      console.log(`    ${colorize('匹配:', 'blue')} ${issue.match}`);
-      console.log(`    ${colorize('建议:', 'green')} ${getSuggestion(issue.type)}`);
+      out.push(`  ${colorize('●', severityColor)} 第${issue.line}行: ${issue.type}`);
+      out.push(`    ${colorize(issue.content, 'reset')}`);
+      out.push(`    ${colorize('匹配:', 'blue')} ${issue.match}`);
+      out.push(`    ${colorize('建议:', 'green')} ${getSuggestion(issue.type)}`);
     });
   });
 
   // 统计信息
-  console.log(colorize('\n📊 统计信息', 'bold'));
-  console.log(colorize('-'.repeat(30), 'blue'));
-  console.log(`总问题数: ${colorize(totalIssues, 'red')}`);
-  console.log(`影响文件: ${colorize(results.length, 'yellow')}`);
+  out.push(colorize('\n📊 统计信息', 'bold'));
+  out.push(colorize('-'.repeat(30), 'blue'));
+  out.push(`总问题数: ${colorize(totalIssues, 'red')}`);
+  out.push(`影响文件: ${colorize(results.length, 'yellow')}`);
 
   Object.entries(issueStats).forEach(([type, count]) => {
-    console.log(`${type}: ${colorize(count, 'yellow')}`);
+    out.push(`${type}: ${colorize(count, 'yellow')}`);
   });
 
   // 建议
-  console.log(colorize('\n💡 修复建议', 'bold'));
-  console.log(colorize('-'.repeat(30), 'blue'));
-  console.log('1. 查阅 docs/type-safety-guide.md 获取详细指南');
-  console.log('2. 使用 npm run type-safety:report 生成详细报告');
-  console.log('3. 优先修复 any 类型断言和 unknown 类型使用');
-
-  process.exit(totalIssues > 0 ? 1 : 0);
+  out.push(colorize('\n💡 修复建议', 'bold'));
+  out.push(colorize('-'.repeat(30), 'blue'));
+  out.push('1. 查阅 docs/type-safety-guide.md 获取详细指南');
+  out.push('2. 使用 npm run type-safety:report 生成详细报告');
+  out.push('3. 优先修复 any 类型断言和 unknown 类型使用');
+
+  process.stdout.write(`${out.join('\n')}\n`);
+  // 用 exitCode 而不是 process.exit()，保证管道场景下 stdout 完整冲刷
+  process.exitCode = totalIssues > 0 ? 1 : 0;
 }
 
-// 获取问题严重程度
-function getSeverity(type) {
-  const severityMap = {
-    anyAssertion: 'high',
-    unknownUsage: 'medium',
-    anyType: 'medium',
-    deprecatedTypes: 'low'
-  };
-  return severityMap[type] || 'low';
-}
+// 统计各规则命中次数，供维护 RULES 的命中率排序时使用
+function printProfile(results) {
+  const counts = new Map(RULES.map((rule) => [rule.type, 0]));
+  results.forEach((fileResult) => {
+    fileResult.issues.forEach((issue) => {
+      counts.set(issue.type, (counts.get(issue.type) || 0) + 1);
+    });
+  });
 
-// 获取修复建议
-function getSuggestion(type) {
-  const suggestions = {
-    anyAssertion: '使用类型守卫函数替代 as any',
-    unknownUsage: '提供具体的类型定义',
-    anyType: '使用具体的类型或联合类型',
-    deprecatedTypes: '迁移到 StandardApiResponse'
-  };
-  return suggestions[type] || '查阅类型安全指南';
+  console.log(colorize('\n📈 规则命中统计（降序）', 'bold'));
+  [...counts.entries()]
+    .sort((a, b) => b[1] - a[1])
+    .forEach(([type, count]) => {
+      console.log(`${type}: ${colorize(count, 'yellow')}`);
+    });
 }
 
 // 主函数
-function main() {
+async function main() {
   console.log(colorize('🚀 开始 TypeScript 类型安全检查...', 'blue'));
 
   if (!fs.existsSync(CONFIG.srcDir)) {
@@ -187,12 +378,21 @@ function main() {
     process.exit(1);
   }
 
-  const results = scanDirectory(CONFIG.srcDir);
+  const results = await scanDirectory(CONFIG.srcDir);
+
+  if (process.argv.includes('--profile')) {
+    printProfile(results);
+    return;
+  }
+
   generateReport(results);
 }
 
-// 运行检查
-if (require.main === module) {
+// 工作线程分支：扫描分到的文件并回传结果
+if (!isMainThread && workerData && workerData.files) {
+  parentPort.postMessage(workerData.files.map((filePath) => scanFile(filePath)));
+} else if (require.main === module) {
+  // 运行检查
   main();
 }
 
@@ -13,22 +13,24 @@
  * @since v4.11.0
  */
 
+const crypto = require('crypto');
 const fs = require('fs');
 const path = require('path');
 const { scanDirectory } = require('./type-safety-check');
+const { getSeverity, getSuggestion } = require('./type-safety-rules');
 
 // 配置
 const CONFIG = {
   srcDir: path.join(__dirname, '../src/renderer'),
   outputDir: path.join(__dirname, '../reports'),
-  reportFile: 'type-safety-report.html'
+  reportFile: 'type-safety-report.html',
+  // 上次报告对应的扫描结果指纹，结果没变时跳过整个 HTML 生成
+  fingerprintFile: '.type-safety-report.hash'
 };
 
-// 确保输出目录存在
+// 确保输出目录存在（recursive 模式本身幂等，无需先 existsSync 探测）
 function ensureOutputDir() {
-  if (!fs.existsSync(CONFIG.outputDir)) {
-    fs.mkdirSync(CONFIG.outputDir, { recursive: true });
-  }
+  fs.mkdirSync(CONFIG.outputDir, { recursive: true });
 }
 
 // 生成HTML报告
@@ -241,28 +243,6 @@ function generateHtmlReport(results) {
   return html;
 }
 
-// 获取问题严重程度
-function getSeverity(type) {
-  const severityMap = {
-    anyAssertion: 'high',
-    unknownUsage: 'medium',
-    anyType: 'medium',
-    deprecatedTypes: 'low'
-  };
-  return severityMap[type] || 'low';
-}
-
-// 获取修复建议
-function getSuggestion(type) {
-  const suggestions = {
-    anyAssertion: '使用类型守卫函数替代 as any',
-    unknownUsage: '提供具体的类型定义',
-    anyType: '使用具体的类型或联合类型',
-    deprecatedTypes: '迁移到 StandardApiResponse'
-  };
-  return suggestions[type] || '查阅类型安全指南';
-}
-
 // HTML转义
 function escapeHtml(text) {
   const map = {
@@ -276,18 +256,35 @@ function escapeHtml(text) {
 }
 
 // 主函数
-function main() {
+async function main() {
   console.log('🚀 生成 TypeScript 类型安全详细报告...');
 
   ensureOutputDir();
 
-  const results = scanDirectory(CONFIG.srcDir);
-  const html = generateHtmlReport(results);
-
+  const results = await scanDirectory(CONFIG.srcDir);
   const reportPath = path.join(CONFIG.outputDir, CONFIG.reportFile);
-  fs.writeFileSync(reportPath, html, 'utf8');
+  const fingerprintPath = path.join(CONFIG.outputDir, CONFIG.fingerprintFile);
+
+  // 扫描结果与上次一致且报告还在时，整个生成与写盘流程都可以短路
+  const fingerprint = crypto.createHash('sha1').update(JSON.stringify(results)).digest('hex');
+  let lastFingerprint = '';
+  try {
+    lastFingerprint = fs.readFileSync(fingerprintPath, 'utf8');
+  } catch {
+    // 首次运行或指纹丢失，照常生成
+  }
+
+  if (fingerprint === lastFingerprint && fs.existsSync(reportPath)) {
+    console.log(`✅ 扫描结果无变化，复用已有报告: ${reportPath}`);
+  } else {
+    const html = generateHtmlReport(results);
+    // 先写临时文件再原子替换，避免浏览器读到写一半的报告
+    fs.writeFileSync(`${reportPath}.tmp`, html, 'utf8');
+    fs.renameSync(`${reportPath}.tmp`, reportPath);
+    fs.writeFileSync(fingerprintPath, fingerprint);
+    console.log(`✅ 报告已生成: ${reportPath}`);
+  }
 
-  console.log(`✅ 报告已生成: ${reportPath}`);
   console.log(
     `📊 发现 ${results.reduce((sum, file) => sum + file.issues.length, 0)} 个问题，影响 ${results.length} 个文件`
   );
@@ -0,0 +1,61 @@
+/**
+ * TypeScript 类型安全检查规则表
+ *
+ * check 与 report 脚本共用的唯一规则来源，每条规则包含：
+ * - pattern: 匹配问题的正则
+ * - trigger: 命中文本必然包含的固定子串，用于扫描前预筛
+ * - severity / suggestion: 报告展示用的严重程度与修复建议
+ *
+ * @author TypeScript重构项目组
+ * @since v4.11.0
+ */
+
+// 规则按实测命中率降序排列（type-safety-check --profile 可重新统计），
+// 合并后的正则按此顺序尝试分支，高频规则先命中可减少无效尝试
+const RULES = [
+  {
+    type: 'anyType',
+    pattern: /:\s*any\b/,
+    trigger: 'any',
+    severity: 'medium',
+    suggestion: '使用具体的类型或联合类型'
+  },
+  {
+    type: 'anyAssertion',
+    pattern: /as\s+any\b/,
+    trigger: 'any',
+    severity: 'high',
+    suggestion: '使用类型守卫函数替代 as any'
+  },
+  {
+    type: 'unknownUsage',
+    pattern: /:\s*unknown\b/,
+    trigger: 'unknown',
+    severity: 'medium',
+    suggestion: '提供具体的类型定义'
+  },
+  {
+    type: 'deprecatedTypes',
+    // [^>]* 代替 .*，匹配限定在本个泛型参数列表内，避免长行上的回溯
+    pattern: /(ApiResponse|BaseApiResponse|BaseResponse)<[^>]*unknown[^>]*>/,
+    trigger: 'Response<',
+    severity: 'low',
+    suggestion: '迁移到 StandardApiResponse'
+  }
+];
+
+const RULE_INDEX = new Map(RULES.map((rule) => [rule.type, rule]));
+
+// 获取问题严重程度
+function getSeverity(type) {
+  const rule = RULE_INDEX.get(type);
+  return rule ? rule.severity : 'low';
+}
+
+// 获取修复建议
+function getSuggestion(type) {
+  const rule = RULE_INDEX.get(type);
+  return rule ? rule.suggestion : '查阅类型安全指南';
+}
+
+module.exports = { RULES, getSeverity, getSuggestion };